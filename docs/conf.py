@@ -0,0 +1,10 @@
+"""Sphinx configuration."""
+
+project = "binance-api-fetcher"
+author = "Zezas"
+
+extensions = [
+    "sphinx.ext.autodoc",
+    "sphinx.ext.napoleon",
+    "sphinx_autodoc_typehints",
+]
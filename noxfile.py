@@ -0,0 +1,385 @@
+"""Nox sessions."""
+
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import os
+import re
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import nox
+from nox.sessions import Session
+
+PACKAGE = "binance_api_fetcher"
+HERE = Path(__file__).parent
+PYTHON_VERSION_REX = re.compile(r"^(\d+\.\d+)", re.MULTILINE)
+
+# Share one wheel cache across all session venvs so each wheel is
+# downloaded and built at most once per lock file change.
+os.environ.setdefault("PIP_CACHE_DIR", str(HERE / ".pip-cache"))
+os.environ.setdefault("PIP_DISABLE_PIP_VERSION_CHECK", "1")
+
+
+def _parse_version(raw: str) -> Tuple[int, int]:
+    """Parse a pyenv version line into a comparable tuple.
+
+    Args:
+        raw: The matched "major.minor" string.
+
+    Returns:
+        The major and minor version numbers.
+    """
+    major, minor, *_ = raw.split(".")
+    return (int(major), int(minor))
+
+
+python_versions = [
+    f"{major}.{minor}"
+    for major, minor in sorted(
+        {
+            _parse_version(raw)
+            for raw in PYTHON_VERSION_REX.findall(
+                (HERE / ".python-version").read_text()
+            )
+        }
+    )
+]
+dev_python = python_versions[-1]
+
+# safety is deliberately not a default session: it pulls a heavy
+# dependency tree and hits the network, so it runs on CI only.
+nox.options.sessions = "lint", "mypy", "test"
+# uv creates venvs and installs wheels an order of magnitude faster
+# than virtualenv+pip; fall back to virtualenv where uv is missing.
+nox.options.default_venv_backend = "uv|virtualenv"
+nox.options.reuse_existing_virtualenvs = True
+
+
+def _run_nox_session(session_id: str) -> int:
+    """Run a single nox session in a subprocess.
+
+    Args:
+        session_id: The session identifier, e.g. "test-3.11".
+
+    Returns:
+        The exit code of the nox invocation.
+    """
+    return subprocess.run(["nox", "-s", session_id], check=False).returncode
+
+
+_CONSTRAINTS_CACHE: Dict[str, Path] = {}
+
+
+def _export_constraints(session: Session) -> Path:
+    """Export the poetry lock file to a cached requirements file.
+
+    The export is captured straight from poetry's stdout and written
+    once to .nox_cache, keyed by the hash of poetry.lock, so a nox
+    invocation runs poetry export at most once per lock file instead of
+    once per session and no temporary files are involved.
+
+    Args:
+        session: The nox session.
+
+    Returns:
+        The path of the exported requirements file.
+    """
+    lock_file = HERE / "poetry.lock"
+    if not lock_file.exists():
+        session.error(
+            "poetry.lock not found; run `poetry lock` and commit the "
+            "file so the constraints export has a lock to key on."
+        )
+    key = hashlib.sha1(lock_file.read_bytes()).hexdigest()
+    cached = _CONSTRAINTS_CACHE.get(key)
+    if cached is not None and cached.exists():
+        return cached
+    cache_dir = HERE / ".nox_cache"
+    cache_dir.mkdir(exist_ok=True)
+    constraints = cache_dir / f"constraints-{key}.txt"
+    if not constraints.exists():
+        exported = subprocess.run(
+            [
+                "poetry",
+                "export",
+                "--with",
+                "dev",
+                "--format=requirements.txt",
+                "--without-hashes",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=HERE,
+        ).stdout
+        constraints.write_text(exported)
+    _CONSTRAINTS_CACHE[key] = constraints
+    return constraints
+
+
+def install_with_constraints(
+    session: Session, *args: str, **kwargs: Any
+) -> None:
+    """Install packages constrained by the poetry lock file.
+
+    Args:
+        session: The nox session.
+        args: The packages to install.
+        kwargs: Extra keyword arguments for session.install.
+    """
+    constraints = _export_constraints(session)
+    session.install(
+        "--prefer-binary", f"--requirement={constraints}", *args, **kwargs
+    )
+
+
+def _typeguard_args(session: Session) -> List[str]:
+    """Build the typeguard arguments for a pytest run.
+
+    Runtime type-checking wraps every call in the package with
+    signature introspection and slows the suite down noticeably, so it
+    is opt-in: pass --typeguard in the posargs (the "test-typed"
+    session always enables it).
+
+    Args:
+        session: The nox session.
+
+    Returns:
+        The typeguard arguments, or an empty list.
+    """
+    if "--typeguard" in session.posargs:
+        return ["--typeguard-packages", PACKAGE]
+    return []
+
+
+def _pytest_args(session: Session) -> List[str]:
+    """Build the argument list for a pytest run.
+
+    Distributes tests across cores with pytest-xdist unless the caller
+    already picked a worker count in the session posargs.
+
+    Args:
+        session: The nox session.
+
+    Returns:
+        The arguments to prepend to the pytest invocation.
+    """
+    if "-n" in session.posargs:
+        return []
+    return ["-n", str(max(1, (os.cpu_count() or 2) - 2)), "--dist=loadfile"]
+
+
+@nox.session(python=python_versions, name="test")
+def pytest(session: Session) -> None:
+    """Run the full test suite.
+
+    Args:
+        session: The nox session.
+    """
+    args = [a for a in session.posargs if a != "--typeguard"]
+    session.run("poetry", "install", "--only", "main", external=True)
+    install_with_constraints(
+        session, "pytest", "pytest-mock", "pytest-xdist", "typeguard"
+    )
+    session.run(
+        "pytest", *_pytest_args(session), *_typeguard_args(session), *args
+    )
+
+
+@nox.session(python=dev_python, name="test-unit")
+def pytest_unit(session: Session) -> None:
+    """Run the unit tests.
+
+    Args:
+        session: The nox session.
+    """
+    args = [
+        a for a in (session.posargs or ["-m", "unit"]) if a != "--typeguard"
+    ]
+    session.run("poetry", "install", "--only", "main", external=True)
+    install_with_constraints(
+        session, "pytest", "pytest-mock", "pytest-xdist", "typeguard"
+    )
+    session.run(
+        "pytest", *_pytest_args(session), *_typeguard_args(session), *args
+    )
+
+
+@nox.session(python=dev_python, name="test-integration")
+def pytest_integration(session: Session) -> None:
+    """Run the integration tests.
+
+    Args:
+        session: The nox session.
+    """
+    args = [
+        a
+        for a in (session.posargs or ["-m", "integration"])
+        if a != "--typeguard"
+    ]
+    session.run("poetry", "install", "--only", "main", external=True)
+    install_with_constraints(
+        session, "pytest", "pytest-mock", "pytest-xdist", "typeguard"
+    )
+    session.run(
+        "pytest", *_pytest_args(session), *_typeguard_args(session), *args
+    )
+
+
+@nox.session(python=dev_python, name="test-e2e")
+def pytest_e2e(session: Session) -> None:
+    """Run the end-to-end tests.
+
+    Args:
+        session: The nox session.
+    """
+    args = [
+        a for a in (session.posargs or ["-m", "e2e"]) if a != "--typeguard"
+    ]
+    session.run("poetry", "install", "--only", "main", external=True)
+    install_with_constraints(
+        session, "pytest", "pytest-mock", "pytest-xdist", "typeguard"
+    )
+    session.run(
+        "pytest", *_pytest_args(session), *_typeguard_args(session), *args
+    )
+
+
+@nox.session(python=dev_python, name="test-typed")
+def pytest_typed(session: Session) -> None:
+    """Run the full test suite with runtime type-checking enabled.
+
+    Args:
+        session: The nox session.
+    """
+    args = [a for a in session.posargs if a != "--typeguard"]
+    session.run("poetry", "install", "--only", "main", external=True)
+    install_with_constraints(
+        session, "pytest", "pytest-mock", "pytest-xdist", "typeguard"
+    )
+    session.run(
+        "pytest",
+        *_pytest_args(session),
+        "--typeguard-packages",
+        PACKAGE,
+        *args,
+    )
+
+
+@nox.session(python=dev_python, name="parallel", venv_backend="none")
+def parallel(session: Session) -> None:
+    """Run the matrixed sessions concurrently, one process per entry.
+
+    Every (session, python version) pair builds its own virtualenv and
+    exports its own constraints, so the entries are independent and the
+    wall-clock win is roughly min(matrix size, cpu count). Virtualenvs
+    are reused across runs via nox.options.reuse_existing_virtualenvs.
+
+    Args:
+        session: The nox session.
+    """
+    session_ids = ["lint"]
+    session_ids += [f"mypy-{pyver}" for pyver in python_versions]
+    session_ids += [f"test-{pyver}" for pyver in python_versions]
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        exit_codes = list(executor.map(_run_nox_session, session_ids))
+    failed = [
+        session_id
+        for session_id, exit_code in zip(session_ids, exit_codes)
+        if exit_code != 0
+    ]
+    if failed:
+        session.error(f"Sessions failed: {', '.join(failed)}")
+
+
+@nox.session(python=dev_python)
+def black(session: Session) -> None:
+    """Format the code base with black.
+
+    Args:
+        session: The nox session.
+    """
+    args = session.posargs or ["src", "tests", "noxfile.py"]
+    install_with_constraints(session, "black")
+    session.run("black", *args)
+
+
+@nox.session(python=dev_python)
+def lint(session: Session) -> None:
+    """Lint the code base with flake8.
+
+    Args:
+        session: The nox session.
+    """
+    args = session.posargs or ["src", "tests", "noxfile.py"]
+    install_with_constraints(
+        session, "flake8", "flake8-bugbear", "flake8-docstrings", "isort"
+    )
+    session.run("flake8", *args)
+    session.run("isort", "--check-only", *args)
+
+
+@nox.session(python=python_versions)
+def mypy(session: Session) -> None:
+    """Type-check the code base with mypy.
+
+    Args:
+        session: The nox session.
+    """
+    args = session.posargs or ["src", "tests"]
+    session.run("poetry", "install", "--only", "main", external=True)
+    install_with_constraints(session, "mypy", "pytest")
+    session.run("mypy", *args)
+
+
+@nox.session(python=dev_python)
+def safety(session: Session) -> None:
+    """Scan the locked dependencies for known vulnerabilities.
+
+    Args:
+        session: The nox session.
+    """
+    install_with_constraints(session, "safety")
+    constraints = _export_constraints(session)
+    session.env["SAFETY_CACHE_DIR"] = str(HERE / ".safety-cache")
+    session.run(
+        "safety",
+        "check",
+        "--cache",
+        f"--file={constraints}",
+        "--full-report",
+    )
+
+
+@nox.session(python=dev_python)
+def docs(session: Session) -> None:
+    """Build the documentation with sphinx.
+
+    Args:
+        session: The nox session.
+    """
+    session.run("poetry", "install", "--only", "main", external=True)
+    install_with_constraints(session, "sphinx", "sphinx-autodoc-typehints")
+    # No -E: reusing the pickled environment between runs keeps
+    # incremental builds cheap; -j auto parallelizes the write phase.
+    session.run(
+        "sphinx-build",
+        "-j",
+        "auto",
+        "-W",
+        "--keep-going",
+        "docs",
+        "docs/_build",
+    )
+
+
+@nox.session(python=dev_python)
+def coverage(session: Session) -> None:
+    """Report test coverage.
+
+    Args:
+        session: The nox session.
+    """
+    install_with_constraints(session, "coverage[toml]")
+    session.run("coverage", "report", "--show-missing")
@@ -0,0 +1,8 @@
+"""Fetch data from Binance using its API."""
+
+from importlib.metadata import PackageNotFoundError, version
+
+try:
+    __version__ = version("binance-api-fetcher")
+except PackageNotFoundError:  # pragma: no cover
+    __version__ = "0.0.0"
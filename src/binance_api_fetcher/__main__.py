@@ -0,0 +1,188 @@
+"""Command line entrypoint of the binance-api-fetcher service."""
+
+import argparse
+import functools
+import logging
+import os
+import sys
+
+from binance_api_fetcher import __version__
+
+logger = logging.getLogger(__name__)
+
+_TRUE = frozenset({"true", "1", "yes", "on", "True"})
+
+_FORMATTER = logging.Formatter(
+    fmt=(
+        "%(asctime)s.%(msecs)03d %(levelname)s "
+        "%(module)s - %(funcName)s: %(message)s"
+    ),
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+
+
+def _to_bool(value: str) -> bool:
+    """Parse an environment variable value as a boolean flag.
+
+    Args:
+        value: The raw value of the environment variable.
+
+    Returns:
+        True if the value spells a truthy flag, False otherwise.
+    """
+    return value in _TRUE
+
+
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser of the service.
+
+    Building the parser performs a dozen add_argument calls plus the
+    help formatter setup, so the result is cached; call
+    _build_parser.cache_clear() to pick up changed environment
+    variables.
+
+    Returns:
+        The configured argument parser.
+    """
+    env = os.environ
+    parser = argparse.ArgumentParser(
+        prog="binance-api-fetcher",
+        description="Fetch data from Binance using its API.",
+    )
+    parser.add_argument(
+        "--log-level",
+        type=str,
+        default=env.get("LOG_LEVEL", "info"),
+        choices=["debug", "info", "warning", "error", "critical"],
+        help="Level of the service logs.",
+    )
+    parser.add_argument(
+        "--run-as-service",
+        type=_to_bool,
+        default=_to_bool(env.get("RUN_AS_SERVICE", "True")),
+        help="Keep scraping on a sleep interval instead of running once.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        type=_to_bool,
+        default=_to_bool(env.get("DRY_RUN", "False")),
+        help="Compute events without persisting or publishing them.",
+    )
+    parser.add_argument(
+        "--source",
+        type=str,
+        default=env.get("SOURCE", "https://api.binance.com/api/v3/"),
+        help="URL of the Binance API.",
+    )
+    parser.add_argument(
+        "--target",
+        type=str,
+        default=env.get(
+            "TARGET",
+            (
+                "user=username password=password "
+                "host=localhost port=5432 dbname=binance"
+            ),
+        ),
+        help="Connection string of the target database.",
+    )
+    parser.add_argument(
+        "--min-sleep",
+        type=int,
+        default=int(env.get("MIN_SLEEP", "15")),
+        help="Minimum sleep time between requests, in seconds.",
+    )
+    parser.add_argument(
+        "--max-sleep",
+        type=int,
+        default=int(env.get("MAX_SLEEP", "30")),
+        help="Maximum sleep time between requests, in seconds.",
+    )
+    parser.add_argument(
+        "--poll-backoff-base",
+        type=float,
+        default=float(env.get("POLL_BACKOFF_BASE", "1.3")),
+        help=(
+            "Factor the poll interval grows by on rate limits and "
+            "shrinks by on success, within the sleep bounds."
+        ),
+    )
+    parser.add_argument(
+        "--symbol",
+        type=_to_bool,
+        default=_to_bool(env.get("SYMBOL", "True")),
+        help="Scrape the symbol entity.",
+    )
+    parser.add_argument(
+        "--kline-1d",
+        type=_to_bool,
+        default=_to_bool(env.get("KLINE_1D", "True")),
+        help="Scrape the kline_1d entity.",
+    )
+    parser.add_argument(
+        "--datapoint-limit",
+        type=int,
+        default=int(env.get("DATAPOINT_LIMIT", "500")),
+        help="Maximum number of datapoints fetched per request.",
+    )
+    parser.add_argument(
+        "--shard",
+        type=int,
+        default=int(env.get("SHARD", "0")),
+        help="Shard of the symbol universe assigned to this instance.",
+    )
+    return parser
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the service arguments.
+
+    Every argument defaults to the value of the matching environment
+    variable, so the service can be configured either way.
+
+    Returns:
+        The parsed service arguments.
+    """
+    return _build_parser().parse_args()
+
+
+def logging_config(log_level: str) -> None:
+    """Configure the logging of the service.
+
+    Safe to call more than once: force=True replaces any handlers
+    configured earlier instead of stacking a duplicate, so repeated
+    imports in tests do not multiply log output.
+
+    Args:
+        log_level: Level of the service logs.
+    """
+    handler = logging.StreamHandler(stream=sys.stdout)
+    handler.setFormatter(_FORMATTER)
+    logging.basicConfig(
+        level=log_level.upper(),
+        handlers=[handler],
+        force=True,
+    )
+
+
+def main() -> None:
+    """Run the binance-api-fetcher service."""
+    parsed_args = parse_args()
+    logging_config(log_level=parsed_args.log_level)
+    # Imported lazily so --help and argument errors do not pay for the
+    # model package and its transitive dependencies.
+    from binance_api_fetcher.model import Service
+
+    logger.info("Starting binance-api-fetcher v%s service.", __version__)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("args=%s", parsed_args)
+    service = Service(args=parsed_args)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("service=%s", service)
+    service.run()
+    logger.info("Service binance-api-fetcher v%s shutdown.", __version__)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,22 @@
+"""Model of the binance-api-fetcher service."""
+
+from binance_api_fetcher.model.entity import Entity
+from binance_api_fetcher.model.event import (
+    EventLog,
+    EventType,
+    Key,
+    MessagesEncoder,
+    State,
+)
+from binance_api_fetcher.model.service import Service, ServiceError
+
+__all__ = [
+    "Entity",
+    "EventLog",
+    "EventType",
+    "Key",
+    "MessagesEncoder",
+    "Service",
+    "ServiceError",
+    "State",
+]
@@ -0,0 +1,60 @@
+"""Endpoints of the Binance API used by the service."""
+
+from typing import Any, Dict
+
+
+class SymbolEndpoint:
+    """Endpoint serving the exchange information, including symbols."""
+
+    url = "exchangeInfo"
+
+    def parameters(self) -> Dict[str, Any]:
+        """Build the query parameters of a request.
+
+        Returns:
+            The query parameters.
+        """
+        return {}
+
+
+class KlineEndpoint:
+    """Endpoint serving the daily klines of a symbol."""
+
+    url = "klines"
+    interval = "1d"
+
+    def base_parameters(self, limit: int) -> Dict[str, Any]:
+        """Build the query parameters shared by a whole scrape run.
+
+        Args:
+            limit: The maximum number of klines to fetch.
+
+        Returns:
+            The query parameters that do not vary per symbol.
+        """
+        return {"interval": self.interval, "limit": limit}
+
+    def parameters(
+        self, symbol: str, start_time: int, limit: int
+    ) -> Dict[str, Any]:
+        """Build the query parameters of a request.
+
+        Args:
+            symbol: The symbol to fetch klines for.
+            start_time: The open time to start fetching from, in ms.
+            limit: The maximum number of klines to fetch.
+
+        Returns:
+            The query parameters.
+        """
+        return {
+            "symbol": symbol,
+            "startTime": start_time,
+            **self.base_parameters(limit=limit),
+        }
+
+
+# Singleton per endpoint; the scrape handlers are per-entity already,
+# so they bind the concrete endpoint directly and keep its full type.
+SYMBOL_ENDPOINT = SymbolEndpoint()
+KLINE_ENDPOINT = KlineEndpoint()
@@ -0,0 +1,26 @@
+"""Entities the service scrapes from the source."""
+
+from enum import Enum
+
+
+class Entity(str, Enum):
+    """An entity the service scrapes and persists."""
+
+    SYMBOL = "symbol"
+    KLINE_1D = "kline_1d"
+
+    def __init__(self, value: str) -> None:
+        """Precompute the repr so hot paths do not re-stringify it.
+
+        Args:
+            value: The wire value of the member.
+        """
+        self._repr = value
+
+    def __repr__(self) -> str:
+        """Render the entity as its wire value.
+
+        Returns:
+            The value of the entity.
+        """
+        return self._repr
@@ -0,0 +1,192 @@
+"""Event sourcing primitives for scraped records."""
+
+from enum import Enum
+import json
+from typing import Any, Iterable, List, Optional, Tuple
+
+Key = Tuple[Any, ...]
+
+
+class EventType(str, Enum):
+    """The type of change an event log records."""
+
+    CREATE = "create"
+    AMEND = "amend"
+    REMOVE = "remove"
+
+    def __repr__(self) -> str:
+        """Render the event type as its wire value.
+
+        Returns:
+            The value of the event type.
+        """
+        return str(self.value)
+
+
+class State:
+    """The state of a single record of an entity."""
+
+    __slots__ = ("key", "values", "event_id")
+
+    def __init__(
+        self,
+        key: Key,
+        values: Tuple[Any, ...],
+        event_id: Optional[int] = None,
+    ) -> None:
+        """Create a state from its components.
+
+        Args:
+            key: The primary key of the record.
+            values: The non-key fields of the record.
+            event_id: The id of the event that produced this state.
+        """
+        self.key = key
+        self.values = values
+        self.event_id = event_id
+
+    @classmethod
+    def from_source(cls, key: Key, values: Tuple[Any, ...]) -> "State":
+        """Build a state from a record scraped from the source.
+
+        Args:
+            key: The primary key of the record.
+            values: The non-key fields of the record.
+
+        Returns:
+            The state of the scraped record.
+        """
+        return cls(key=key, values=values)
+
+    @classmethod
+    def from_source_batch(
+        cls, keyed_values: Iterable[Tuple[Key, Tuple[Any, ...]]]
+    ) -> List["State"]:
+        """Build states for a whole batch of scraped records.
+
+        One pass over the batch, no intermediate per-row containers.
+
+        Args:
+            keyed_values: The (key, values) pairs of the records.
+
+        Returns:
+            The states of the scraped records.
+        """
+        return [cls(key=key, values=values) for key, values in keyed_values]
+
+    @classmethod
+    def removal_instance(cls, key: Key) -> "State":
+        """Build the terminal state of a removed record.
+
+        Args:
+            key: The primary key of the removed record.
+
+        Returns:
+            A state with no values, marking the removal.
+        """
+        return cls(key=key, values=())
+
+    def as_tuple(self) -> Tuple[Any, ...]:
+        """Flatten the state into a row for the target database.
+
+        Returns:
+            The key, values and event id as a single tuple.
+        """
+        return self.key + self.values + (self.event_id,)
+
+    def __repr__(self) -> str:
+        """Render the state for logging.
+
+        Returns:
+            The key and event id of the state.
+        """
+        return f"State(key={self.key}, event_id={self.event_id})"
+
+
+class EventLog:
+    """A change of state of a single record of an entity."""
+
+    __slots__ = ("event_type", "prev", "curr")
+
+    def __init__(
+        self,
+        event_type: EventType,
+        prev: Optional[State],
+        curr: State,
+    ) -> None:
+        """Create an event log from its components.
+
+        Args:
+            event_type: The type of the change.
+            prev: The state before the change, if any.
+            curr: The state after the change.
+        """
+        self.event_type = event_type
+        self.prev = prev
+        self.curr = curr
+
+    @classmethod
+    def from_states(
+        cls,
+        event_type: EventType,
+        prev: Optional[State],
+        curr: State,
+    ) -> "EventLog":
+        """Build an event log from the states before and after a change.
+
+        Args:
+            event_type: The type of the change.
+            prev: The state before the change, if any.
+            curr: The state after the change.
+
+        Returns:
+            The event log recording the change.
+        """
+        return cls(event_type=event_type, prev=prev, curr=curr)
+
+    def as_record(self) -> Tuple[Any, ...]:
+        """Flatten the event log into a row for the log table.
+
+        Removal states carry no values, so the values of the previous
+        state are recorded instead.
+
+        Returns:
+            The event id, event type, key and values as a single tuple.
+        """
+        values = self.curr.values
+        if not values and self.prev is not None:
+            values = self.prev.values
+        return (
+            (self.curr.event_id, self.event_type.value)
+            + self.curr.key
+            + values
+        )
+
+    def __repr__(self) -> str:
+        """Render the event log for logging.
+
+        Returns:
+            The event type and key of the event log.
+        """
+        return f"EventLog(event_type={self.event_type!r}, key={self.curr.key})"
+
+
+class MessagesEncoder(json.JSONEncoder):
+    """JSON encoder that understands the event sourcing primitives."""
+
+    def default(self, o: Any) -> Any:
+        """Encode states, event logs and enums.
+
+        Args:
+            o: The object to encode.
+
+        Returns:
+            A JSON-serializable representation of the object.
+        """
+        if isinstance(o, EventLog):
+            return o.as_record()
+        if isinstance(o, State):
+            return o.as_tuple()
+        if isinstance(o, Enum):
+            return o.value
+        return super().default(o)
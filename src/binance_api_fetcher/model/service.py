@@ -0,0 +1,708 @@
+"""Service that fetches data from Binance and persists it."""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from itertools import islice
+import logging
+import random
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    cast,
+)
+import uuid
+
+import orjson
+from prometheus_client import Counter
+import requests
+
+from binance_api_fetcher import __version__
+from binance_api_fetcher.model.endpoint import (
+    KLINE_ENDPOINT,
+    SYMBOL_ENDPOINT,
+)
+from binance_api_fetcher.model.entity import Entity
+from binance_api_fetcher.model.event import (
+    EventLog,
+    EventType,
+    Key,
+    MessagesEncoder,
+    State,
+)
+from binance_api_fetcher.persistence import (
+    Publisher,
+    Source,
+    Target,
+    TargetError,
+)
+from binance_api_fetcher.persistence.queries import (
+    EntityQueries,
+    KlineQueries,
+    SymbolQueries,
+)
+
+logger = logging.getLogger(__name__)
+
+Events = Dict[EventType, List[EventLog]]
+
+QUERIES: Dict[Entity, Type[EntityQueries]] = {
+    Entity.SYMBOL: SymbolQueries,
+    Entity.KLINE_1D: KlineQueries,
+}
+
+_METRIC_LABELS = ("app", "version", "team", "component")
+
+_METRIC_LABEL_VALUES = (
+    "binance-api-fetcher",
+    __version__,
+    "analytics",
+    "loaders",
+)
+
+
+class ServiceError(Exception):
+    """Raised when the service cannot recover from an error."""
+
+
+class Service:
+    """Scrape entities from the source and persist them in the target."""
+
+    # Bounded so a full-universe scrape stays well inside Binance's
+    # per-IP request weight budget.
+    _SCRAPE_CONCURRENCY = 8
+
+    # Seconds a cached DACS ranking stays valid before it is refetched.
+    _DACS_RANK_TTL = 3600.0
+
+    # Events published per message; bounds message size while keeping
+    # the per-publish overhead off the per-event path.
+    _PUBLISH_BATCH_SIZE = 256
+
+    # Seconds after the UTC daily close before new klines are polled,
+    # giving the source time to materialize the closed candle.
+    _CLOSE_SETTLE_SECONDS = 5.0
+
+    # Status codes the source is known to answer with; their children
+    # are resolved up front in declare_metrics. The phrases come from
+    # the stdlib http.HTTPStatus table.
+    _TRACKED_STATUS_CODES = (
+        200,
+        400,
+        401,
+        403,
+        404,
+        418,
+        429,
+        500,
+        502,
+        503,
+    )
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        """Create a service from its parsed arguments.
+
+        Args:
+            args: The parsed service arguments.
+        """
+        self._run_as_service = args.run_as_service
+        self._dry_run = args.dry_run
+        self._source = Source(connection_string=args.source)
+        self._target = Target(connection_string=args.target)
+        self._publisher = Publisher()
+        self._min_sleep = args.min_sleep
+        self._max_sleep = args.max_sleep
+        self._backoff_base = args.poll_backoff_base
+        self._backoff = float(args.min_sleep)
+        self._symbol = args.symbol
+        self._kline_1d = args.kline_1d
+        self._datapoint_limit = args.datapoint_limit
+        self._shard = args.shard
+        self._entities: List[Entity] = []
+        if self._symbol:
+            self._entities.append(Entity.SYMBOL)
+        if self._kline_1d:
+            self._entities.append(Entity.KLINE_1D)
+        self._request_counters: Dict[Entity, Counter] = {}
+        self._event_counters: Dict[Entity, Counter] = {}
+        self._status_code_children: Dict[Entity, Dict[int, Counter]] = {}
+        self._event_type_children: Dict[
+            Entity, Dict[EventType, Counter]
+        ] = {}
+        self._dacs_rank: Optional[Dict[str, int]] = None
+        self._dacs_rank_expires = 0.0
+
+    def run(self) -> None:
+        """Run the service until it finishes or is interrupted."""
+        self._source.connect()
+        self._target.connect()
+        self.declare_metrics()
+        if self._run_as_service:
+            self.run_service()
+        else:
+            self.run_once()
+        self.tear_down()
+
+    def run_service(self) -> None:
+        """Scrape all entities on an adaptive sleep interval, forever.
+
+        The interval follows the backoff adjusted per response: it
+        grows while the source rate-limits or errors and shrinks back
+        towards the minimum while responses are healthy, with jitter to
+        decorrelate instances.
+        """
+        while True:
+            self.run_once()
+            t = self._backoff * random.uniform(0.8, 1.2)
+            if Entity.KLINE_1D in self._entities:
+                # Daily klines appear right after the UTC close; cap
+                # the sleep so a poll lands just past that boundary
+                # instead of waiting out a full interval.
+                t = min(t, self._seconds_until_daily_close())
+            logger.debug(msg=f"Sleeping for {t:.2f} seconds.")
+            time.sleep(t)
+
+    @classmethod
+    def _seconds_until_daily_close(cls) -> float:
+        """Seconds until just after the next UTC daily kline close.
+
+        Returns:
+            The seconds until the next UTC midnight plus the settle
+            margin.
+        """
+        now = datetime.now(timezone.utc)
+        next_close = (now + timedelta(days=1)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        return (next_close - now).total_seconds() + cls._CLOSE_SETTLE_SECONDS
+
+    def run_once(self) -> None:
+        """Scrape all entities once."""
+        for entity in self._entities:
+            self.scrape(entity=entity)
+
+    def declare_metrics(self) -> None:
+        """Declare the prometheus metrics of the service.
+
+        The labelled children of every counter are resolved here, once,
+        so the increment paths do a dict lookup and an inc() instead of
+        a labels() resolution per hit.
+        """
+        for entity in self._entities:
+            request_counter = Counter(
+                name=f"{entity.value}_requests",
+                documentation=f"Requests performed for {entity.value}.",
+                labelnames=_METRIC_LABELS + ("status_code",),
+            )
+            self._request_counters[entity] = request_counter
+            self._status_code_children[entity] = {
+                status_code: request_counter.labels(
+                    *_METRIC_LABEL_VALUES, HTTPStatus(status_code).phrase
+                )
+                for status_code in self._TRACKED_STATUS_CODES
+            }
+            event_counter = Counter(
+                name=f"{entity.value}_events",
+                documentation=f"Events computed for {entity.value}.",
+                labelnames=_METRIC_LABELS + ("event_type",),
+            )
+            self._event_counters[entity] = event_counter
+            self._event_type_children[entity] = {
+                event_type: event_counter.labels(
+                    *_METRIC_LABEL_VALUES, event_type.value
+                )
+                for event_type in EventType
+            }
+
+    def increment_status_code(self, entity: Entity, status_code: int) -> None:
+        """Count a response of the source by status code.
+
+        Args:
+            entity: The entity the request was performed for.
+            status_code: The status code of the response.
+        """
+        children = self._status_code_children[entity]
+        child = children.get(status_code)
+        if child is None:
+            # Untracked status code; resolve its child once and keep it.
+            try:
+                label = HTTPStatus(status_code).phrase
+            except ValueError:
+                label = str(status_code)
+            child = self._request_counters[entity].labels(
+                *_METRIC_LABEL_VALUES, label
+            )
+            children[status_code] = child
+        child.inc()
+
+    def _adjust_backoff(self, status_code: int) -> None:
+        """Adapt the poll backoff to a response of the source.
+
+        Args:
+            status_code: The status code of the response.
+        """
+        if status_code == 429 or status_code >= 500:
+            self._backoff = min(
+                float(self._max_sleep), self._backoff * self._backoff_base
+            )
+        elif status_code == 200:
+            self._backoff = max(
+                float(self._min_sleep), self._backoff / self._backoff_base
+            )
+
+    def increment_counters(self, entity: Entity, events: Events) -> None:
+        """Count the events of a delivery by event type.
+
+        Args:
+            entity: The entity the events were computed for.
+            events: The events of the delivery.
+        """
+        children = self._event_type_children[entity]
+        for event_type, logs in events.items():
+            children[event_type].inc(len(logs))
+
+    def scrape(self, entity: Entity) -> None:
+        """Scrape an entity from the source and process the responses.
+
+        Dispatches through a per-entity handler table: a single dict
+        lookup instead of a chain of identity checks.
+
+        Args:
+            entity: The entity to scrape.
+        """
+        self._SCRAPE_HANDLERS[entity](self, entity)
+
+    def _scrape_symbol(self, entity: Entity) -> None:
+        """Scrape the symbol entity in a single request.
+
+        Args:
+            entity: The entity to scrape.
+        """
+        endpoint = SYMBOL_ENDPOINT
+        response = self._source.request(
+            url=endpoint.url, params=endpoint.parameters()
+        )
+        if response is None:
+            # Transport-level failure; back off as a server error.
+            self._adjust_backoff(status_code=500)
+            return
+        self.increment_status_code(
+            entity=entity, status_code=response.status_code
+        )
+        self._adjust_backoff(status_code=response.status_code)
+        if response.status_code == 200:
+            self.process(entity=entity, response=response)
+
+    def _scrape_kline_1d(self, entity: Entity) -> None:
+        """Scrape the kline_1d entity, fanning requests out over threads.
+
+        Requests overlap on network latency: the interpreter releases
+        the GIL during socket I/O and the source's pooled session is
+        shared across workers, so wall time is bounded by the slowest
+        response per wave instead of the sum of round trips. Responses
+        are processed on the calling thread as they complete, keeping
+        metrics and persistence single-threaded.
+
+        Args:
+            entity: The entity to scrape.
+        """
+        endpoint = KLINE_ENDPOINT
+        symbols = self._target.get_symbols(
+            query=KlineQueries.LOAD_SYMBOLS, shard=self._shard
+        )
+        if not symbols:
+            return
+        # The interval and limit do not vary within a scrape run; build
+        # them once and merge the per-symbol part in the loop.
+        base_params = endpoint.base_parameters(limit=self._datapoint_limit)
+        url = endpoint.url
+        request = self._source.request
+        with ThreadPoolExecutor(
+            max_workers=min(len(symbols), self._SCRAPE_CONCURRENCY)
+        ) as executor:
+            submit = executor.submit
+            futures = {
+                submit(
+                    request,
+                    url,
+                    {**base_params, "symbol": s[0], "startTime": s[1]},
+                ): s[0]
+                for s in symbols
+            }
+            for index, future in enumerate(as_completed(list(futures))):
+                # Popping drops the last reference to the future once
+                # the iteration ends, so each response body is freed
+                # after processing instead of accumulating until the
+                # whole scrape finishes.
+                symbol = futures.pop(future)
+                response = future.result()
+                if response is None:
+                    # Transport-level failure; back off as a server
+                    # error and move on to the next symbol.
+                    self._adjust_backoff(status_code=500)
+                    continue
+                self.increment_status_code(
+                    entity=entity, status_code=response.status_code
+                )
+                self._adjust_backoff(status_code=response.status_code)
+                if response.status_code == 200:
+                    self.process(
+                        entity=entity,
+                        response=response,
+                        symbol=symbol,
+                    )
+                elif response.status_code == 429:
+                    t = self._backoff * random.uniform(0.8, 1.2)
+                    logger.debug(
+                        msg=f"Rate limited; sleeping for {t:.2f} seconds."
+                    )
+                    time.sleep(t)
+                logger.debug(
+                    msg=f"Scraped symbol {index + 1}/{len(symbols)}."
+                )
+
+    # Scrape dispatch table; resolved per entity with one dict lookup.
+    _SCRAPE_HANDLERS: Dict[Entity, Callable[["Service", Entity], None]] = {
+        Entity.SYMBOL: _scrape_symbol,
+        Entity.KLINE_1D: _scrape_kline_1d,
+    }
+
+    def _get_dacs_rank(self) -> Dict[str, int]:
+        """Get the DACS rank of every symbol of the shard.
+
+        The ranking table changes rarely, so the dict is cached and only
+        refetched from the target once the TTL has passed or after a
+        failed delivery invalidated it.
+
+        Returns:
+            The rank of every symbol, by symbol.
+        """
+        now = time.monotonic()
+        if self._dacs_rank is None or now >= self._dacs_rank_expires:
+            symbols = self._target.get_symbols(
+                query=SymbolQueries.LOAD_DACS, shard=self._shard
+            )
+            self._dacs_rank = {s[1]: s[0] for s in symbols}
+            self._dacs_rank_expires = now + self._DACS_RANK_TTL
+        return self._dacs_rank
+
+    def parse(
+        self,
+        entity: Entity,
+        response: requests.Response,
+        symbol: Optional[str] = None,
+    ) -> List[State]:
+        """Parse a response of the source into states.
+
+        Args:
+            entity: The entity the response belongs to.
+            response: The response of the source.
+            symbol: The symbol the response belongs to, for per-symbol
+                endpoints.
+
+        Returns:
+            The states of the records in the response.
+        """
+        try:
+            # orjson accepts bytes, skipping the charset detection and
+            # bytes-to-str decode response.text would perform.
+            records = orjson.loads(response.content)
+        except orjson.JSONDecodeError as error:
+            logger.error(
+                msg=(
+                    f"Got a json error while parsing the response: "
+                    f"{type(error).__name__} - {error}."
+                )
+            )
+            return []
+        if entity is Entity.SYMBOL:
+            dacs_rank = self._get_dacs_rank()
+            return [
+                State.from_source(
+                    key=(record["symbol"],),
+                    values=(
+                        record["baseAsset"],
+                        record["quoteAsset"],
+                        record["status"],
+                        dacs_rank.get(record["symbol"]),
+                    ),
+                )
+                for record in records["symbols"]
+            ]
+        # Kline rows arrive positionally: open_time, open, high, low,
+        # close, volume, close_time, quote_asset_volume,
+        # number_of_trades, taker_buy_base, taker_buy_quote, ignored.
+        # States are built straight from the slices in a single pass.
+        return State.from_source_batch(
+            keyed_values=(((symbol, r[0]), tuple(r[1:11])) for r in records)
+        )
+
+    def process(
+        self,
+        entity: Entity,
+        response: requests.Response,
+        symbol: Optional[str] = None,
+    ) -> None:
+        """Turn a response of the source into a persisted delivery.
+
+        Args:
+            entity: The entity the response belongs to.
+            response: The response of the source.
+            symbol: The symbol the response belongs to, for per-symbol
+                endpoints.
+        """
+        started = time.perf_counter()
+        curr = self.parse(entity=entity, response=response, symbol=symbol)
+        if not curr:
+            return
+        query = QUERIES[entity]
+        key_length = query.KEY_LENGTH
+        # Per-symbol scrapes diff against that symbol's state only;
+        # loading the whole shard would make every other symbol's rows
+        # look removed.
+        params: Tuple[Any, ...] = (self._shard,)
+        if symbol is not None:
+            params += (symbol,)
+        events: Dict[Key, State] = {}
+        for row in self._target.get_current_state(
+            query=query.LOAD_STATE, params=params
+        ):
+            state = State(
+                key=tuple(row[:key_length]),
+                values=tuple(row[key_length:-1]),
+                event_id=row[-1],
+            )
+            events[state.key] = state
+        # One id reservation covers the whole delivery: creates and
+        # amends are bounded by len(curr); removals, only computed for
+        # snapshot entities, by len(events). The sequence tolerates the
+        # unused remainder as gaps.
+        n = len(curr)
+        if query.SNAPSHOT:
+            n += len(events)
+        it_event_id = self._target.get_next_event_id(n=n)
+        delivery_events = self.compute_events(
+            entity=entity, curr=curr, events=events, it_event_id=it_event_id
+        )
+        self.persist_delivery(
+            entity=entity, events=delivery_events, started=started
+        )
+
+    def compute_events(
+        self,
+        entity: Entity,
+        curr: List[State],
+        events: Dict[Key, State],
+        it_event_id: Iterator[int],
+    ) -> Events:
+        """Diff the scraped states against the previous states.
+
+        Removals are only computed for snapshot entities, where a key
+        missing from the response proves the record is gone upstream.
+
+        Args:
+            entity: The entity the states belong to.
+            curr: The states scraped from the source.
+            events: The previous states, indexed by key.
+            it_event_id: The event ids reserved for the delivery.
+
+        Returns:
+            The event logs of the delivery, grouped by event type.
+        """
+        len_curr = len(curr)
+        # create and amend are bounded by len(curr); preallocating and
+        # trimming once avoids the repeated list resizes append would
+        # pay on deliveries in the 100k range.
+        create: List[Optional[EventLog]] = [None] * len_curr
+        amend: List[Optional[EventLog]] = [None] * len_curr
+        ci = 0
+        ai = 0
+        curr_keys: Set[Key] = set()
+        # Bound locals keep the loop free of repeated attribute and
+        # global lookups; each of these would otherwise be resolved
+        # once per record.
+        get_prev = events.get
+        add_curr_key = curr_keys.add
+        from_states = EventLog.from_states
+        amend_type = EventType.AMEND
+        create_type = EventType.CREATE
+        for i, item in enumerate(curr):
+            if i % 100_000 == 0:
+                logger.debug(
+                    msg=f"Computing events: {i}/{len_curr} for {entity!r}."
+                )
+            # One hash probe per item: events.get covers both the
+            # membership test and the lookup of the previous state.
+            key = item.key
+            add_curr_key(key)
+            prev = get_prev(key)
+            if prev is not None:
+                if prev.values != item.values:
+                    item.event_id = next(it_event_id)
+                    amend[ai] = from_states(
+                        event_type=amend_type, prev=prev, curr=item
+                    )
+                    ai += 1
+            else:
+                item.event_id = next(it_event_id)
+                create[ci] = from_states(
+                    event_type=create_type, prev=None, curr=item
+                )
+                ci += 1
+        del create[ci:]
+        del amend[ai:]
+        remove: List[Optional[EventLog]] = []
+        if QUERIES[entity].SNAPSHOT:
+            # Only a full snapshot can prove absence; a windowed scrape
+            # must not treat records outside its window as removed.
+            prev_keys: Set[Key] = events.keys() - curr_keys
+            remove = [None] * len(prev_keys)
+            for ri, prev_key in enumerate(prev_keys):
+                prev = events[prev_key]
+                removal = State.removal_instance(key=prev_key)
+                removal.event_id = next(it_event_id)
+                remove[ri] = EventLog.from_states(
+                    event_type=EventType.REMOVE, prev=prev, curr=removal
+                )
+        return {
+            EventType.CREATE: cast(List[EventLog], create),
+            EventType.AMEND: cast(List[EventLog], amend),
+            EventType.REMOVE: cast(List[EventLog], remove),
+        }
+
+    def persist_delivery(
+        self, entity: Entity, events: Events, started: float
+    ) -> None:
+        """Persist and publish the events of a delivery.
+
+        Args:
+            entity: The entity the events were computed for.
+            events: The events of the delivery.
+            started: The perf_counter timestamp the delivery started at.
+        """
+        if self._dry_run:
+            logger.info(
+                msg=(
+                    f"Dry run: computed "
+                    f"{sum(len(logs) for logs in events.values())} events "
+                    f"for {entity!r}."
+                )
+            )
+            return
+        self._target.begin_transaction()
+        try:
+            self.persist_postgres(entity=entity, events=events)
+            max_event_id = self.publish_messages(delivery={entity: events})
+            summary: Dict[str, Any] = {
+                event_type.value: len(logs)
+                for event_type, logs in events.items()
+            }
+            summary["max_event_id"] = max_event_id
+            self._target.persist_delivery(
+                row=(
+                    str(uuid.uuid4()),
+                    entity.value,
+                    self._shard,
+                    datetime.now(timezone.utc),
+                    orjson.dumps(
+                        summary, default=MessagesEncoder().default
+                    ).decode(),
+                    time.perf_counter() - started,
+                )
+            )
+            self._target.commit_transaction()
+        except TargetError:
+            self._target.rollback_transaction()
+            # The ranking may have been the stale part of the delivery;
+            # drop it so the retry refetches it.
+            self._dacs_rank = None
+            raise
+        self.increment_counters(entity=entity, events=events)
+
+    def persist_postgres(self, entity: Entity, events: Events) -> None:
+        """Persist the events of a delivery in the target database.
+
+        Args:
+            entity: The entity the events were computed for.
+            events: The events of the delivery.
+        """
+        query = QUERIES[entity]
+        for event_type in (EventType.CREATE, EventType.AMEND):
+            event_logs = events[event_type]
+            if not event_logs:
+                continue
+            # One pass builds both row shapes. The upsert rows are
+            # keyed by state key so a batch with colliding keys keeps
+            # the last occurrence, as the per-row loop used to.
+            upsert_rows: Dict[Key, Tuple[Any, ...]] = {}
+            log_rows: List[Tuple[Any, ...]] = []
+            for e in event_logs:
+                upsert_rows[e.curr.key] = e.curr.as_tuple()
+                log_rows.append(e.as_record())
+            self._target.bulk_upsert(
+                table=query.TABLE,
+                columns=query.COLUMNS,
+                merge=query.UPSERT_FROM_STAGING,
+                rows=upsert_rows.values(),
+            )
+            self._target.copy_rows(
+                table=query.LOG_TABLE,
+                columns=query.LOG_COLUMNS,
+                rows=log_rows,
+            )
+        remove_logs = events[EventType.REMOVE]
+        if remove_logs:
+            delete_keys: List[Key] = []
+            log_rows = []
+            for e in remove_logs:
+                delete_keys.append(e.curr.key)
+                log_rows.append(e.as_record())
+            self._target.delete_rows(query=query.DELETE, keys=delete_keys)
+            self._target.copy_rows(
+                table=query.LOG_TABLE,
+                columns=query.LOG_COLUMNS,
+                rows=log_rows,
+            )
+
+    def publish_messages(
+        self, delivery: Dict[Entity, Events]
+    ) -> Optional[int]:
+        """Publish the events of a delivery and track the highest id.
+
+        Args:
+            delivery: The events of the delivery, grouped by entity.
+
+        Returns:
+            The highest event id published, if any.
+        """
+        for events in delivery.values():
+            for logs in events.values():
+                it = iter(logs)
+                while batch := list(islice(it, self._PUBLISH_BATCH_SIZE)):
+                    self._publisher.notify_events_batch(events=batch)
+        # The reduction runs once over the concatenated iterable inside
+        # max(). Every published log was assigned an id when its event
+        # was computed; the None filter states that for the type
+        # checker rather than guarding a reachable case.
+        event_ids = (
+            log.curr.event_id
+            for events in delivery.values()
+            for logs in events.values()
+            for log in logs
+            if log.curr.event_id is not None
+        )
+        return max(event_ids, default=None)
+
+    def tear_down(self) -> None:
+        """Disconnect from the source and the target."""
+        self._source.disconnect()
+        self._target.disconnect()
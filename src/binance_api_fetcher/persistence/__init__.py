@@ -0,0 +1,13 @@
+"""Persistence layer of the binance-api-fetcher service."""
+
+from binance_api_fetcher.persistence.publisher import Publisher
+from binance_api_fetcher.persistence.source import Source, SourceError
+from binance_api_fetcher.persistence.target import Target, TargetError
+
+__all__ = [
+    "Publisher",
+    "Source",
+    "SourceError",
+    "Target",
+    "TargetError",
+]
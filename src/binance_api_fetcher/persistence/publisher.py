@@ -0,0 +1,32 @@
+"""Publisher of event messages produced by the service."""
+
+import logging
+from typing import TYPE_CHECKING, List
+
+import orjson
+
+if TYPE_CHECKING:  # pragma: no cover
+    from binance_api_fetcher.model.event import EventLog
+
+logger = logging.getLogger(__name__)
+
+
+class Publisher:
+    """Publish event logs to downstream consumers.
+
+    The transport is the service log stream: every event is serialized
+    and emitted on the "messages" logger, where the log shipper picks
+    it up and forwards it to the message bus.
+    """
+
+    def notify_events_batch(self, events: List["EventLog"]) -> None:
+        """Publish a batch of event logs as a single message.
+
+        One message per batch keeps the per-publish overhead of the
+        transport off the per-event path.
+
+        Args:
+            events: The event logs to publish.
+        """
+        records = [event.as_record() for event in events]
+        logger.info(msg=orjson.dumps(records, default=str).decode())
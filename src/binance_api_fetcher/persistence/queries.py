@@ -0,0 +1,165 @@
+"""SQL queries used by the service against the target database."""
+
+from typing import Tuple
+
+
+class EntityQueries:
+    """Queries every scraped entity provides.
+
+    The per-entity classes override these attributes; typing them here
+    lets callers work against the shared shape.
+    """
+
+    KEY_LENGTH: int
+    SNAPSHOT: bool
+    TABLE: str
+    COLUMNS: Tuple[str, ...]
+    LOG_TABLE: str
+    LOG_COLUMNS: Tuple[str, ...]
+    LOAD_STATE: str
+    UPSERT_FROM_STAGING: str
+    DELETE: str
+
+
+class SymbolQueries(EntityQueries):
+    """Queries of the symbol entity."""
+
+    KEY_LENGTH = 1
+    # The source response is a full snapshot: a key missing from it
+    # has been removed upstream.
+    SNAPSHOT = True
+    TABLE = "symbol"
+    COLUMNS = (
+        "symbol",
+        "base_asset",
+        "quote_asset",
+        "status",
+        "dacs_rank",
+        "event_id",
+    )
+    LOG_TABLE = "symbol_log"
+    LOG_COLUMNS = (
+        "event_id",
+        "event_type",
+        "symbol",
+        "base_asset",
+        "quote_asset",
+        "status",
+        "dacs_rank",
+    )
+    LOAD_DACS = "SELECT dacs_rank, symbol FROM symbol WHERE shard = %s;"
+    LOAD_STATE = (
+        "SELECT symbol, base_asset, quote_asset, status, dacs_rank, event_id "
+        "FROM symbol WHERE shard = %s;"
+    )
+    UPSERT_FROM_STAGING = (
+        "INSERT INTO symbol "
+        "(symbol, base_asset, quote_asset, status, dacs_rank, event_id) "
+        "SELECT symbol, base_asset, quote_asset, status, dacs_rank, "
+        "event_id FROM {staging} "
+        "ON CONFLICT (symbol) DO UPDATE SET "
+        "base_asset = EXCLUDED.base_asset, "
+        "quote_asset = EXCLUDED.quote_asset, "
+        "status = EXCLUDED.status, "
+        "dacs_rank = EXCLUDED.dacs_rank, "
+        "event_id = EXCLUDED.event_id;"
+    )
+    DELETE = "DELETE FROM symbol WHERE symbol = ANY(%s);"
+
+
+class KlineQueries(EntityQueries):
+    """Queries of the kline_1d entity."""
+
+    KEY_LENGTH = 2
+    # The source response is a window from startTime on, per symbol; a
+    # key missing from it may simply be outside the window, so absence
+    # never means removal.
+    SNAPSHOT = False
+    TABLE = "kline_1d"
+    COLUMNS = (
+        "symbol",
+        "open_time",
+        "open",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "close_time",
+        "quote_asset_volume",
+        "number_of_trades",
+        "taker_buy_base",
+        "taker_buy_quote",
+        "event_id",
+    )
+    LOG_TABLE = "kline_1d_log"
+    LOG_COLUMNS = (
+        "event_id",
+        "event_type",
+        "symbol",
+        "open_time",
+        "open",
+        "high",
+        "low",
+        "close",
+        "volume",
+        "close_time",
+        "quote_asset_volume",
+        "number_of_trades",
+        "taker_buy_base",
+        "taker_buy_quote",
+    )
+    LOAD_SYMBOLS = (
+        "SELECT symbol, next_open_time FROM symbol "
+        "WHERE shard = %s ORDER BY dacs_rank;"
+    )
+    LOAD_STATE = (
+        "SELECT symbol, open_time, open, high, low, close, volume, "
+        "close_time, quote_asset_volume, number_of_trades, "
+        "taker_buy_base, taker_buy_quote, event_id "
+        "FROM kline_1d WHERE shard = %s AND symbol = %s;"
+    )
+    UPSERT_FROM_STAGING = (
+        "INSERT INTO kline_1d "
+        "(symbol, open_time, open, high, low, close, volume, close_time, "
+        "quote_asset_volume, number_of_trades, taker_buy_base, "
+        "taker_buy_quote, event_id) "
+        "SELECT symbol, open_time, open, high, low, close, volume, "
+        "close_time, quote_asset_volume, number_of_trades, taker_buy_base, "
+        "taker_buy_quote, event_id FROM {staging} "
+        "ON CONFLICT (symbol, open_time) DO UPDATE SET "
+        "open = EXCLUDED.open, "
+        "high = EXCLUDED.high, "
+        "low = EXCLUDED.low, "
+        "close = EXCLUDED.close, "
+        "volume = EXCLUDED.volume, "
+        "close_time = EXCLUDED.close_time, "
+        "quote_asset_volume = EXCLUDED.quote_asset_volume, "
+        "number_of_trades = EXCLUDED.number_of_trades, "
+        "taker_buy_base = EXCLUDED.taker_buy_base, "
+        "taker_buy_quote = EXCLUDED.taker_buy_quote, "
+        "event_id = EXCLUDED.event_id;"
+    )
+    DELETE = (
+        "DELETE FROM kline_1d "
+        "USING UNNEST(%s::text[], %s::bigint[]) "
+        "AS keys (symbol, open_time) "
+        "WHERE kline_1d.symbol = keys.symbol "
+        "AND kline_1d.open_time = keys.open_time;"
+    )
+
+
+class TargetQueries:
+    """Queries of the target database itself."""
+
+    PING = (
+        "SELECT CONCAT(current_user, '@', inet_server_addr(), ':', "
+        "inet_server_port(), ' - ', version()) AS ping;"
+    )
+    NEXT_EVENT_ID = (
+        "SELECT nextval('event_id_seq') FROM generate_series(1, %s);"
+    )
+    PERSIST_DELIVERY = (
+        "INSERT INTO delivery "
+        "(delivery_id, entity, shard, row_creation, summary, runtime) "
+        "VALUES (%s, %s, %s, %s, %s, %s);"
+    )
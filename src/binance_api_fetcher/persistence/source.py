@@ -0,0 +1,99 @@
+"""Source of the binance-api-fetcher service."""
+
+import logging
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+logger = logging.getLogger(__name__)
+
+
+class SourceError(Exception):
+    """Raised when the source cannot be reached or queried."""
+
+
+class Source:
+    """Connection to the Binance API."""
+
+    # URL used to test the connectivity to the source, relative to the
+    # base URL.
+    PING_URL = "ping"
+
+    _url: str
+    _is_connected: bool
+
+    def __init__(self, connection_string: str) -> None:
+        """Create a source from its connection string.
+
+        A pooled session keeps the TCP+TLS connection to the API alive
+        across requests, so the per-symbol scrape loop does not pay a
+        handshake per call.
+
+        Args:
+            connection_string: Base URL of the Binance API.
+        """
+        self._url = connection_string
+        self._is_connected = False
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+            ),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    @property
+    def is_connected(self) -> bool:
+        """Whether the source has been connected to successfully."""
+        return self._is_connected
+
+    def connect(self) -> None:
+        """Test the connectivity to the source.
+
+        Raises:
+            SourceError: If the source does not answer the ping.
+        """
+        ping_response = self.request(url=self.PING_URL)
+        if ping_response is None or ping_response.status_code != 200:
+            raise SourceError("Got an error connecting to source.")
+        self._is_connected = True
+        logger.info(msg=f"Connected to source: {self._url}.")
+
+    def request(
+        self, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> Optional[requests.Response]:
+        """Perform a GET request against the source.
+
+        Args:
+            url: URL of the endpoint, relative to the base URL.
+            params: Query parameters of the request.
+
+        Returns:
+            The response of the source, or None when the request fails
+            at the transport level.
+        """
+        try:
+            return self._session.get(
+                url=self._url + url, params=params, timeout=(3.05, 120)
+            )
+        except requests.RequestException as error:
+            logger.error(
+                msg=(
+                    f"Got a requests error while querying source: "
+                    f"{type(error).__name__} - {error}."
+                )
+            )
+            return None
+
+    def disconnect(self) -> None:
+        """Disconnect from the source and release pooled connections."""
+        self._session.close()
+        self._is_connected = False
+        logger.info(msg=f"Disconnected from source: {self._url}.")
@@ -0,0 +1,428 @@
+"""Target of the binance-api-fetcher service."""
+
+import functools
+from io import StringIO
+import logging
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+import psycopg2
+from psycopg2.extensions import connection as Connection
+from psycopg2.extensions import cursor as Cursor
+
+from binance_api_fetcher.persistence.queries import TargetQueries
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class TargetError(Exception):
+    """Raised when the target cannot be reached or queried."""
+
+
+def _wrap_target_errors(action: str) -> Callable[[F], F]:
+    """Wrap a Target method with the standard psycopg2 error handling.
+
+    Every database-facing method used to carry the same try/except
+    block; this decorator holds the one copy of it, so the methods
+    keep only their success path.
+
+    Args:
+        action: What the method was doing, phrased as a gerund; used
+            in the log line and the raised error message.
+
+    Returns:
+        A decorator applying the error handling to a method.
+    """
+
+    def decorator(method: F) -> F:
+        @functools.wraps(method)
+        def wrapper(self: "Target", *args: Any, **kwargs: Any) -> Any:
+            try:
+                return method(self, *args, **kwargs)
+            except psycopg2.Error as error:
+                logger.error(
+                    "Got a psycopg2 error while %s: %s - %s.",
+                    action,
+                    type(error).__name__,
+                    error,
+                )
+                raise TargetError(f"Got an error {action}.") from error
+
+        return cast(F, wrapper)
+
+    return decorator
+
+
+class Target:
+    """Connection to the target PostgreSQL database."""
+
+    # Rows fetched per page when streaming a named cursor.
+    _STATE_PAGE_SIZE = 10_000
+
+    __slots__ = (
+        "_connection_string",
+        "_target_connection",
+        "_target_cursor",
+        "_is_connected",
+        "_transaction_in_progress",
+        "_server_info",
+    )
+
+    _connection_string: str
+    _target_connection: Optional[Connection]
+    _target_cursor: Optional[Cursor]
+    _is_connected: bool
+    _transaction_in_progress: bool
+    _server_info: Optional[str]
+
+    def __init__(self, connection_string: str) -> None:
+        """Create a target from its connection string.
+
+        Args:
+            connection_string: Connection string of the database.
+        """
+        self._connection_string = connection_string
+        self._target_connection = None
+        self._target_cursor = None
+        self._is_connected = False
+        self._transaction_in_progress = False
+        self._server_info = None
+
+    @property
+    def is_connected(self) -> bool:
+        """Whether the target has been connected to successfully."""
+        return self._is_connected
+
+    @property
+    @_wrap_target_errors(action="creating a cursor")
+    def cursor(self) -> Cursor:
+        """Persistent cursor to the target database.
+
+        The cursor is created once at connect time and reused for
+        every operation; it is only recreated if it was closed.
+
+        Returns:
+            The cursor to the target database.
+
+        Raises:
+            TargetError: If the cursor cannot be created.
+        """
+        if self._target_cursor is None or self._target_cursor.closed:
+            assert self._target_connection is not None
+            self._target_cursor = self._target_connection.cursor()
+        return self._target_cursor
+
+    @_wrap_target_errors(action="connecting to target")
+    def connect(self) -> None:
+        """Connect to the target database.
+
+        Raises:
+            TargetError: If the connection cannot be established.
+        """
+        self._target_connection = psycopg2.connect(
+            dsn=self._connection_string
+        )
+        self._target_cursor = self._target_connection.cursor()
+        self._is_connected = True
+        logger.info(
+            msg=f"Connected to target: {self.ping_datasource(force=True)}."
+        )
+
+    @_wrap_target_errors(action="pinging the target")
+    def ping_datasource(self, force: bool = False) -> str:
+        """Ping the target database.
+
+        The user, server and version cannot change within a
+        connection, so the answer is cached after the first round
+        trip and reused until the next forced ping.
+
+        Args:
+            force: Whether to query the server again even when a
+                cached answer exists.
+
+        Returns:
+            A string identifying the user, server and version.
+
+        Raises:
+            TargetError: If the ping cannot be executed.
+        """
+        if not force and self._server_info is not None:
+            return self._server_info
+        cursor: Cursor = self.cursor
+        cursor.execute(TargetQueries.PING)
+        row = cursor.fetchone()
+        self._server_info = row[0] if row else ""
+        return self._server_info
+
+    @_wrap_target_errors(action="beginning a transaction")
+    def begin_transaction(self) -> None:
+        """Begin a transaction on the target database.
+
+        The transaction commits with synchronous_commit off, so the
+        commit returns once the WAL record is in memory instead of
+        waiting for the disk flush. A crash can lose the last few
+        deliveries but never corrupts them, and the service recomputes
+        lost deliveries from the API on its next cycle.
+
+        Raises:
+            TargetError: If the transaction cannot be started.
+        """
+        cursor: Cursor = self.cursor
+        cursor.execute("BEGIN; SET LOCAL synchronous_commit = off;")
+        self._transaction_in_progress = True
+
+    @_wrap_target_errors(action="committing a transaction")
+    def commit_transaction(self) -> None:
+        """Commit the transaction in progress.
+
+        Raises:
+            TargetError: If the transaction cannot be committed.
+        """
+        assert self._target_connection is not None
+        self._target_connection.commit()
+        self._transaction_in_progress = False
+
+    @_wrap_target_errors(action="rolling back a transaction")
+    def rollback_transaction(self) -> None:
+        """Roll back the transaction in progress.
+
+        Raises:
+            TargetError: If the transaction cannot be rolled back.
+        """
+        assert self._target_connection is not None
+        self._target_connection.rollback()
+        self._transaction_in_progress = False
+
+    @_wrap_target_errors(action="deleting rows")
+    def delete_rows(self, query: str, keys: List[Tuple[Any, ...]]) -> None:
+        """Delete rows with a single set-based statement.
+
+        The keys are transposed into one array per key column, so the
+        server parses, plans and executes one statement for the whole
+        batch instead of one DELETE per key.
+
+        Args:
+            query: The SQL delete taking one array per key column.
+            keys: The keys of the rows to delete.
+
+        Raises:
+            TargetError: If the rows cannot be deleted.
+        """
+        cursor: Cursor = self.cursor
+        cursor.execute(query, [list(column) for column in zip(*keys)])
+
+    @staticmethod
+    def _format_copy_value(value: Any) -> str:
+        """Render a value in the PostgreSQL COPY text format.
+
+        Args:
+            value: The value to render.
+
+        Returns:
+            The rendered value, with None mapped to the COPY null marker
+            and the delimiter characters escaped.
+        """
+        if value is None:
+            return "\\N"
+        return (
+            str(value)
+            .replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+        )
+
+    @_wrap_target_errors(action="copying rows")
+    def copy_rows(
+        self,
+        table: str,
+        columns: Tuple[str, ...],
+        rows: Iterable[Tuple[Any, ...]],
+    ) -> None:
+        """Stream rows into a table with COPY.
+
+        COPY sends the whole batch in one protocol message, so it
+        replaces one round trip per row with one per batch.
+
+        Args:
+            table: The table to copy the rows into.
+            columns: The columns the rows provide, in order.
+            rows: The rows to copy.
+
+        Raises:
+            TargetError: If the rows cannot be copied.
+        """
+        buffer = StringIO()
+        write = buffer.write
+        fmt = self._format_copy_value
+        for row in rows:
+            write("\t".join(fmt(value) for value in row))
+            write("\n")
+        buffer.seek(0)
+        cursor: Cursor = self.cursor
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer
+        )
+
+    @_wrap_target_errors(action="upserting through a staging table")
+    def bulk_upsert(
+        self,
+        table: str,
+        columns: Tuple[str, ...],
+        merge: str,
+        rows: Iterable[Tuple[Any, ...]],
+    ) -> None:
+        """Upsert rows in bulk through a temporary staging table.
+
+        The rows are streamed with COPY into a staging table and merged
+        into the target table with a single INSERT ... ON CONFLICT.
+        Rows must have unique keys within the batch, as required by
+        ON CONFLICT.
+
+        Args:
+            table: The table to upsert the rows into.
+            columns: The columns the rows provide, in order.
+            merge: The merge query, with a {staging} placeholder for
+                the staging table name.
+            rows: The rows to upsert.
+
+        Raises:
+            TargetError: If the rows cannot be upserted.
+        """
+        staging = f"staging_{table}"
+        cursor: Cursor = self.cursor
+        cursor.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {staging} "
+            f"(LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP;"
+        )
+        self.copy_rows(table=staging, columns=columns, rows=rows)
+        cursor.execute(merge.format(staging=staging))
+        # The staging table lives until commit; empty it so a later
+        # batch in the same transaction starts clean.
+        cursor.execute(f"TRUNCATE {staging};")
+
+    @_wrap_target_errors(action="loading symbols")
+    def get_symbols(self, query: str, shard: int) -> List[Tuple[Any, ...]]:
+        """Load the symbols of a shard from the target database.
+
+        Args:
+            query: The SQL query loading the symbols.
+            shard: The shard to load the symbols of.
+
+        Returns:
+            The rows returned by the query.
+
+        Raises:
+            TargetError: If the query cannot be executed.
+        """
+        cursor: Cursor = self.cursor
+        cursor.execute(query, (shard,))
+        return cursor.fetchall()
+
+    @_wrap_target_errors(action="loading the current state")
+    def get_current_state(
+        self, query: str, params: Tuple[Any, ...]
+    ) -> Iterator[Tuple[Any, ...]]:
+        """Load the current state of an entity from the target database.
+
+        The query runs on a server-side named cursor and the rows are
+        streamed in pages, so the Python-side memory footprint is one
+        page rather than the whole result, and row processing overlaps
+        the server producing the next page.
+
+        Args:
+            query: The SQL query loading the state.
+            params: The parameters of the query, such as the shard and
+                the symbol of a per-symbol state load.
+
+        Returns:
+            An iterator over the rows returned by the query.
+
+        Raises:
+            TargetError: If the query cannot be executed.
+        """
+        assert self._target_connection is not None
+        cursor = self._target_connection.cursor(name="current_state")
+        cursor.execute(query, params)
+        return self._iter_named_cursor(cursor=cursor)
+
+    @staticmethod
+    def _iter_named_cursor(cursor: Cursor) -> Iterator[Tuple[Any, ...]]:
+        """Yield the rows of a named cursor page by page.
+
+        Args:
+            cursor: The named cursor to drain and close.
+
+        Yields:
+            The rows of the cursor.
+
+        Raises:
+            TargetError: If a page cannot be fetched.
+        """
+        try:
+            while rows := cursor.fetchmany(Target._STATE_PAGE_SIZE):
+                yield from rows
+        except psycopg2.Error as error:
+            logger.error(
+                "Got a psycopg2 error while loading the current state: "
+                "%s - %s.",
+                type(error).__name__,
+                error,
+            )
+            raise TargetError(
+                "Got an error loading the current state."
+            ) from error
+        finally:
+            cursor.close()
+
+    @_wrap_target_errors(action="reserving event ids")
+    def get_next_event_id(self, n: int) -> Iterator[int]:
+        """Reserve the next n event ids.
+
+        Args:
+            n: The number of event ids to reserve.
+
+        Returns:
+            An iterator over the reserved event ids.
+
+        Raises:
+            TargetError: If the ids cannot be reserved.
+        """
+        cursor: Cursor = self.cursor
+        cursor.execute(TargetQueries.NEXT_EVENT_ID, (n,))
+        # A list iterator hands out the ids with a C-level __next__
+        # instead of resuming a generator frame per id.
+        return iter([row[0] for row in cursor.fetchall()])
+
+    @_wrap_target_errors(action="persisting a delivery")
+    def persist_delivery(self, row: Tuple[Any, ...]) -> None:
+        """Persist the summary row of a delivery.
+
+        Args:
+            row: The delivery row to persist.
+
+        Raises:
+            TargetError: If the row cannot be persisted.
+        """
+        cursor: Cursor = self.cursor
+        cursor.execute(TargetQueries.PERSIST_DELIVERY, row)
+
+    def disconnect(self) -> None:
+        """Disconnect from the target database."""
+        if self._target_cursor is not None and not self._target_cursor.closed:
+            self._target_cursor.close()
+        if self._target_connection is not None:
+            self._target_connection.close()
+        self._is_connected = False
+        logger.info(msg="Disconnected from target.")
@@ -0,0 +1,15 @@
+"""Shared fixtures of the test suite."""
+
+from binance_api_fetcher.__main__ import _build_parser
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _clear_parser_cache() -> None:
+    """Drop the cached parser so environment changes are honored.
+
+    The parser is cached with lru_cache in production, where the
+    environment is read once; tests change the environment between
+    runs, so each test starts from an empty cache.
+    """
+    _build_parser.cache_clear()
@@ -0,0 +1,20 @@
+"""Unit tests of the entity module."""
+
+from binance_api_fetcher.model import Entity
+import pytest
+
+
+@pytest.mark.unit
+def test_entity_members() -> None:
+    """The enum holds the entities the service can scrape."""
+    assert Entity.SYMBOL in Entity
+    assert Entity.KLINE_1D in Entity
+    assert Entity.SYMBOL.value == "symbol"
+    assert Entity.KLINE_1D.value == "kline_1d"
+
+
+@pytest.mark.unit
+def test_enum_repr() -> None:
+    """The repr of a member is its wire value."""
+    assert repr(Entity.SYMBOL) == "symbol"
+    assert repr(Entity.KLINE_1D) == "kline_1d"
@@ -0,0 +1,160 @@
+"""Unit tests of the __main__ module."""
+
+from argparse import Namespace
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock, call, patch
+
+from binance_api_fetcher import __version__
+from binance_api_fetcher.__main__ import (
+    _build_parser,
+    logging_config,
+    main,
+    parse_args,
+)
+import pytest
+
+# Expected arguments with no environment variables set; the values
+# also carry the expected types.
+_DEFAULT_EXPECTED = {
+    "log_level": "info",
+    "run_as_service": True,
+    "dry_run": False,
+    "source": "https://api.binance.com/api/v3/",
+    "target": (
+        "user=username password=password "
+        "host=localhost port=5432 dbname=binance"
+    ),
+    "min_sleep": 15,
+    "max_sleep": 30,
+    "poll_backoff_base": 1.3,
+    "symbol": True,
+    "kline_1d": True,
+    "datapoint_limit": 500,
+    "shard": 0,
+}
+
+# Environment variables driving the non-default case.
+_NOT_DEFAULT_ENV = {
+    "LOG_LEVEL": "debug",
+    "RUN_AS_SERVICE": "False",
+    "DRY_RUN": "True",
+    "SOURCE": "https://testnet.binance.vision/api/v3/",
+    "TARGET": "user=test password=test host=test port=5432 dbname=test",
+    "MIN_SLEEP": "1",
+    "MAX_SLEEP": "2",
+    "POLL_BACKOFF_BASE": "1.5",
+    "SYMBOL": "False",
+    "KLINE_1D": "False",
+    "DATAPOINT_LIMIT": "100",
+    "SHARD": "3",
+}
+
+# Expected arguments with every environment variable set.
+_NOT_DEFAULT_EXPECTED = {
+    "log_level": "debug",
+    "run_as_service": False,
+    "dry_run": True,
+    "source": "https://testnet.binance.vision/api/v3/",
+    "target": "user=test password=test host=test port=5432 dbname=test",
+    "min_sleep": 1,
+    "max_sleep": 2,
+    "poll_backoff_base": 1.5,
+    "symbol": False,
+    "kline_1d": False,
+    "datapoint_limit": 100,
+    "shard": 3,
+}
+
+
+# Expected logger.info calls of a main() run; constant, so built once
+# at import instead of once per test.
+_LOGGER_INFO_EXPECTED = [
+    call("Starting binance-api-fetcher v%s service.", __version__),
+    call("Service binance-api-fetcher v%s shutdown.", __version__),
+]
+
+
+@pytest.fixture(scope="module")
+def default_args() -> Namespace:
+    """Parse the default arguments once per module.
+
+    Returns:
+        The arguments parsed with no environment variables set.
+    """
+    _build_parser.cache_clear()
+    with patch.object(sys, "argv", ["binance-api-fetcher"]):
+        return parse_args()
+
+
+@pytest.mark.unit
+def test_parse_args_default(default_args: Namespace) -> None:
+    """Parse the arguments with no environment variables set."""
+    assert isinstance(default_args, Namespace)
+    assert vars(default_args) == _DEFAULT_EXPECTED
+    # Equality alone would let a bool pass as an int and vice versa;
+    # the expected values carry the intended types.
+    assert {
+        name: type(value) for name, value in vars(default_args).items()
+    } == {name: type(value) for name, value in _DEFAULT_EXPECTED.items()}
+
+
+@pytest.mark.unit
+def test_parse_args_not_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Parse the arguments with every environment variable set."""
+    for name, value in _NOT_DEFAULT_ENV.items():
+        monkeypatch.setenv(name, value)
+    with patch.object(sys, "argv", ["binance-api-fetcher"]):
+        args = parse_args()
+    assert vars(args) == _NOT_DEFAULT_EXPECTED
+
+
+@pytest.mark.unit
+@patch("binance_api_fetcher.__main__.logging.basicConfig")
+def test_logging_config(mock_basic_config: MagicMock) -> None:
+    """Configure the logging of the service."""
+    logging_config(log_level="info")
+    mock_basic_config.assert_called_once()
+    assert mock_basic_config.call_args.kwargs["level"] == "INFO"
+
+
+@pytest.fixture
+def main_mocks(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Patch every collaborator of main in one place.
+
+    Args:
+        monkeypatch: The monkeypatch fixture undoing the patches.
+
+    Returns:
+        A namespace holding the mock of each collaborator.
+    """
+    mocks = SimpleNamespace(
+        parse_args=MagicMock(),
+        logging_config=MagicMock(),
+        logger=MagicMock(),
+        service=MagicMock(),
+    )
+    monkeypatch.setattr(
+        "binance_api_fetcher.__main__.parse_args", mocks.parse_args
+    )
+    monkeypatch.setattr(
+        "binance_api_fetcher.__main__.logging_config", mocks.logging_config
+    )
+    monkeypatch.setattr("binance_api_fetcher.__main__.logger", mocks.logger)
+    monkeypatch.setattr("binance_api_fetcher.model.Service", mocks.service)
+    return mocks
+
+
+@pytest.mark.unit
+def test_main_run(main_mocks: SimpleNamespace) -> None:
+    """Run the main function of the service."""
+    main()
+    main_mocks.parse_args.assert_called_once()
+    main_mocks.logging_config.assert_called_once_with(
+        log_level=main_mocks.parse_args.return_value.log_level
+    )
+    main_mocks.service.assert_called_once_with(
+        args=main_mocks.parse_args.return_value
+    )
+    main_mocks.service.return_value.run.assert_called_once()
+    main_mocks.logger.info.assert_has_calls(_LOGGER_INFO_EXPECTED)
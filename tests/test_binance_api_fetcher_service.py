@@ -0,0 +1,99 @@
+"""Unit tests of the service module."""
+
+from argparse import Namespace
+
+from binance_api_fetcher.model import Service
+import pytest
+
+# Connection strings of the mocked arguments, shared by every test
+# that needs them.
+_SOURCE_URL = "https://api.binance.com/api/v3/"
+_CONN_STR = (
+    "user=username password=password host=localhost port=5432 dbname=binance"
+)
+
+
+@pytest.fixture(scope="module")
+def service_args() -> Namespace:
+    """Build the mocked arguments of the service once per module.
+
+    Returns:
+        The mocked arguments.
+    """
+    return Namespace(
+        log_level="debug",
+        run_as_service=True,
+        dry_run=False,
+        source=_SOURCE_URL,
+        target=_CONN_STR,
+        min_sleep=0,
+        max_sleep=1,
+        poll_backoff_base=1.3,
+        symbol=True,
+        kline_1d=True,
+        datapoint_limit=500,
+        shard=0,
+    )
+
+
+@pytest.fixture(scope="module")
+def service(service_args: Namespace) -> Service:
+    """Build a service from the mocked arguments once per module.
+
+    Args:
+        service_args: The mocked arguments of the service.
+
+    Returns:
+        The service under test.
+    """
+    return Service(args=service_args)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "field",
+    [
+        "run_as_service",
+        "dry_run",
+        "min_sleep",
+        "max_sleep",
+        "symbol",
+        "kline_1d",
+        "datapoint_limit",
+        "shard",
+    ],
+)
+def test_service_init_assigns(
+    service: Service, service_args: Namespace, field: str
+) -> None:
+    """Each argument lands on the service attribute of the same name."""
+    assert getattr(service, f"_{field}") == getattr(service_args, field)
+
+
+@pytest.mark.unit
+def test_service_init(service: Service, service_args: Namespace) -> None:
+    """The arguments without a same-named attribute are threaded too."""
+    assert service._source._url == service_args.source
+    assert service._target._connection_string == service_args.target
+    assert service._backoff_base == service_args.poll_backoff_base
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "name",
+    [
+        "run",
+        "run_service",
+        "run_once",
+        "scrape",
+        "parse",
+        "process",
+        "compute_events",
+        "persist_delivery",
+        "persist_postgres",
+        "tear_down",
+    ],
+)
+def test_service_stub(name: str) -> None:
+    """Placeholder for the behavior tests of the service."""
+    pytest.skip(f"{name} is not tested yet")